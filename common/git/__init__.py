@@ -1,4 +1,4 @@
 # common.git - Git utilities
-from common.git.git import Git
+from common.git.git import Git, GitStatus
 
-__all__ = ["Git"]
+__all__ = ["Git", "GitStatus"]
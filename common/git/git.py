@@ -3,7 +3,79 @@ Git class for executing git commands.
 """
 
 import subprocess
-from typing import List, Optional
+from dataclasses import dataclass, field, replace
+from functools import cached_property, wraps
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class GitStatus:
+    """Parsed result of git status --porcelain=v2 --branch."""
+
+    branch_head: str = ""
+    branch_oid: str = ""
+    detached: bool = False
+    changed_files: List[str] = field(default_factory=list)
+    staged_files: List[str] = field(default_factory=list)
+    untracked: List[str] = field(default_factory=list)
+    # Paths grouped by status letter (A, M, D, R, ...) for each side; merge
+    # conflicts are grouped under "U" on the unstaged side only
+    staged_by_status: Dict[str, List[str]] = field(default_factory=dict)
+    changed_by_status: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def has_changes(self) -> bool:
+        """True if there are staged or unstaged changes to tracked files."""
+        return bool(self.staged_files or self.changed_files)
+
+    def copy(self) -> "GitStatus":
+        """Copy with fresh lists and dicts, so edits never reach the original."""
+        return replace(
+            self,
+            changed_files=list(self.changed_files),
+            staged_files=list(self.staged_files),
+            untracked=list(self.untracked),
+            staged_by_status={k: list(v) for k, v in self.staged_by_status.items()},
+            changed_by_status={k: list(v) for k, v in self.changed_by_status.items()},
+        )
+
+
+# Read-only queries may run concurrently, so never take optional index locks
+_GIT = ["git", "--no-optional-locks"]
+
+# Number of space separated fields before the path in porcelain v2 records
+_PORCELAIN_V2_PATH_FIELD = {b"1": 8, b"2": 9, b"u": 10}
+
+
+def _decode(output: bytes) -> str:
+    """Decode raw git output, which is UTF-8 for paths and ASCII otherwise."""
+    return output.decode("utf-8", "replace")
+
+
+def _copy_result(value):
+    """Copy a mutable query result; strings and bools are returned as is."""
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, GitStatus):
+        return value.copy()
+    return value
+
+
+def _memoized(method):
+    """Cache a read-only query on the Git instance until invalidate() is called.
+
+    Each call gets its own copy of a list or GitStatus result, so a caller
+    editing it cannot change what later calls return.
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        if key not in self._query_cache:
+            self._query_cache[key] = method(self, *args, **kwargs)
+        return _copy_result(self._query_cache[key])
+
+    return wrapper
 
 
 class Git:
@@ -11,63 +83,84 @@ class Git:
 
     def __init__(self, cwd: Optional[str] = None):
         self.cwd = cwd
+        self._config_cache: Dict[Tuple[str, bool], str] = {}
+        self._query_cache: Dict[tuple, Any] = {}
+
+    def invalidate(self) -> None:
+        """Forget cached working tree queries.
+
+        Mutating methods on this class call this automatically; call it after
+        changing the repository by other means.
+        """
+        self._query_cache.clear()
 
     def _run(
         self, args: List[str], check: bool = True, capture_output: bool = True
     ) -> subprocess.CompletedProcess:
         result = subprocess.run(
-            ["git"] + args,
+            _GIT + args,
             cwd=self.cwd,
-            capture_output=capture_output,
-            text=True,
+            # Captured queries never read stderr, so let the kernel discard it
+            stdout=subprocess.PIPE if capture_output else None,
+            stderr=subprocess.DEVNULL if capture_output else None,
             check=check,
         )
         return result
 
+    def _run_null(self, args: List[str]) -> List[bytes]:
+        """Run a git command with -z and return its NUL-terminated fields."""
+        return self._run(args + ["-z"]).stdout.split(b"\0")[:-1]
+
     def config(self, key: str, local: bool = True) -> str:
-        """Get a git config value."""
-        try:
-            args = ["config"]
-            if local and self.cwd:
-                args.append("--local")
-            args.append(key)
-            return self._run(args).stdout.strip()
-        except subprocess.CalledProcessError:
+        """Get a git config value (cached for the life of this instance)."""
+        cache_key = (key, local)
+        if cache_key not in self._config_cache:
+            self._config_cache[cache_key] = self._config(key, local)
+        return self._config_cache[cache_key]
+
+    def _config(self, key: str, local: bool) -> str:
+        args = ["config"]
+        if local and self.cwd:
+            args.append("--local")
+        args.append(key)
+        # An unset key exits 1, which is routine rather than an error
+        result = self._run(args, check=False)
+        if result.returncode != 0:
             return ""
+        return _decode(result.stdout.strip())
 
-    @property
+    @cached_property
     def user_email(self) -> str:
         return self.config("user.email")
 
-    @property
+    @cached_property
     def user_signingkey(self) -> str:
         return self.config("user.signingkey")
 
+    @_memoized
     def branch_show_current(self) -> str:
         """Get the current branch name."""
         try:
-            return self._run(["branch", "--show-current"]).stdout.strip()
+            return _decode(self._run(["branch", "--show-current"]).stdout.strip())
         except subprocess.CalledProcessError:
             return ""
 
     def branch_list(self) -> str:
         """List all branches."""
         try:
-            return self._run(["branch"]).stdout.strip()
+            return _decode(self._run(["branch"]).stdout.strip())
         except subprocess.CalledProcessError:
             return ""
 
     def is_detached_head(self) -> bool:
         """Check if HEAD is detached."""
-        result = self.branch_list()
-        if not result:
-            return True
-        return "(HEAD detached" in result
+        # symbolic-ref fails iff HEAD is not a symbolic ref to a branch
+        return self._run(["symbolic-ref", "-q", "HEAD"], check=False).returncode != 0
 
     def rev_parse(self, *args: str) -> str:
         """Run git rev-parse with given arguments."""
         try:
-            return self._run(["rev-parse"] + list(args)).stdout.strip()
+            return _decode(self._run(["rev-parse"] + list(args)).stdout.strip())
         except subprocess.CalledProcessError:
             return ""
 
@@ -76,16 +169,26 @@ class Git:
         result = self.rev_parse("--short", "HEAD")
         return result if result else "initial"
 
+    @cached_property
+    def _repo_paths(self) -> Tuple[str, str]:
+        """Resolve (toplevel, git_dir) with a single rev-parse call."""
+        paths = self.rev_parse("--show-toplevel", "--git-dir").split("\n")
+        if len(paths) == 2:
+            return paths[0], paths[1]
+        # --show-toplevel fails outside a work tree, e.g. inside .git itself
+        return "", self.rev_parse("--git-dir")
+
     @property
     def toplevel(self) -> str:
         """Get the repository root."""
-        return self.rev_parse("--show-toplevel")
+        return self._repo_paths[0]
 
     @property
     def git_dir(self) -> str:
         """Get the .git directory path."""
-        return self.rev_parse("--git-dir")
+        return self._repo_paths[1]
 
+    @_memoized
     def diff_name_only(self, cached: bool = False, diff_filter: str = "") -> List[str]:
         """Get list of changed files."""
         args = ["diff", "--name-only"]
@@ -94,8 +197,7 @@ class Git:
         if diff_filter:
             args.extend(["--diff-filter", diff_filter])
         try:
-            result = self._run(args).stdout.strip()
-            return result.split("\n") if result else []
+            return [_decode(path) for path in self._run_null(args)]
         except subprocess.CalledProcessError:
             return []
 
@@ -104,46 +206,111 @@ class Git:
         args = ["diff", "--quiet"]
         if cached:
             args.insert(1, "--cached")
-        try:
-            self._run(args)
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        # --quiet exits 1 when there are changes, so branch on the exit code
+        return self._run(args, check=False).returncode == 0
 
+    @_memoized
     def has_changes(self) -> bool:
         """Check if there are any uncommitted changes."""
         return not (self.diff_quiet() and self.diff_quiet(cached=True))
 
+    @_memoized
+    def status_porcelain_v2(self, untracked: str = "all") -> GitStatus:
+        """Get branch and working tree state from a single git status call.
+
+        untracked is passed to --untracked-files; use "no" to skip walking the
+        untracked tree when GitStatus.untracked is not needed.
+        """
+        status = GitStatus()
+        args = [
+            "status",
+            "--porcelain=v2",
+            "--branch",
+            # branch.ab is never read, so skip the commit walk against upstream
+            "--no-ahead-behind",
+            f"--untracked-files={untracked}",
+        ]
+        try:
+            records = iter(self._run_null(args))
+        except subprocess.CalledProcessError:
+            return status
+
+        # Parse as bytes and only decode the fields that are kept
+        for record in records:
+            if record.startswith(b"# branch.oid "):
+                status.branch_oid = _decode(record.split(b" ", 2)[2])
+            elif record.startswith(b"# branch.head "):
+                head = _decode(record.split(b" ", 2)[2])
+                status.detached = head == "(detached)"
+                status.branch_head = "" if status.detached else head
+            elif record[:1] in _PORCELAIN_V2_PATH_FIELD:
+                kind = record[:1]
+                path_field = _PORCELAIN_V2_PATH_FIELD[kind]
+                fields = record.split(b" ", path_field)
+                xy, path = _decode(fields[1]), _decode(fields[path_field])
+                if kind == b"2":
+                    # Renames and copies are followed by the original path
+                    next(records, None)
+                if kind == b"u":
+                    # Unmerged paths are not staged whatever XY says; list them
+                    # once, on the unstaged side, as conflicted ("U")
+                    status.changed_files.append(path)
+                    status.changed_by_status.setdefault("U", []).append(path)
+                    continue
+                if xy[0] != ".":
+                    status.staged_files.append(path)
+                    status.staged_by_status.setdefault(xy[0], []).append(path)
+                if xy[1] != ".":
+                    status.changed_files.append(path)
+                    status.changed_by_status.setdefault(xy[1], []).append(path)
+            elif record.startswith(b"? "):
+                status.untracked.append(_decode(record[2:]))
+        return status
+
+    @_memoized
     def ls_files_others(self) -> List[str]:
         """Get list of untracked files."""
         try:
-            result = self._run(
-                ["ls-files", "--others", "--exclude-standard"]
-            ).stdout.strip()
-            return result.split("\n") if result else []
+            paths = self._run_null(["ls-files", "--others", "--exclude-standard"])
+            return [_decode(path) for path in paths]
         except subprocess.CalledProcessError:
             return []
 
+    @_memoized
     def diff_stat(self, cached: bool = False) -> str:
         """Get diff stat summary."""
         args = ["diff", "--stat"]
         if cached:
             args.insert(1, "--cached")
         try:
-            return self._run(args).stdout.strip()
+            return _decode(self._run(args).stdout.strip())
+        except subprocess.CalledProcessError:
+            return ""
+
+    @_memoized
+    def diff_shortstat(self, cached: bool = False) -> str:
+        """Get the one-line diff summary (files changed, insertions, deletions)."""
+        args = ["diff", "--shortstat", "--no-color"]
+        if cached:
+            args.insert(1, "--cached")
+        try:
+            return _decode(self._run(args).stdout.strip())
         except subprocess.CalledProcessError:
             return ""
 
     def checkout_new_branch(self, branch_name: str) -> None:
         """Create and switch to a new branch."""
+        self.invalidate()
         self._run(["checkout", "-b", branch_name], capture_output=False)
 
     def add(self, *files: str) -> None:
         """Stage files."""
+        self.invalidate()
         self._run(["add"] + list(files), capture_output=False)
 
     def commit(self, message: str, sign: bool = False) -> None:
         """Create a commit."""
+        self.invalidate()
         args = ["commit", "-m", message]
         if sign:
             args.insert(0, "-S")
@@ -151,4 +318,5 @@ class Git:
 
     def branch_rename(self, new_name: str) -> None:
         """Rename current branch."""
+        self.invalidate()
         self._run(["branch", "-m", new_name], capture_output=False)
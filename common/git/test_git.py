@@ -48,12 +48,38 @@ class TestGit:
         result = git.config("user.signingkey", local=True)
         assert result == ""
 
+    def test_config_is_cached(self, git, git_repo):
+        assert git.user_email == "test@example.com"
+        subprocess.run(
+            ["git", "config", "--local", "user.email", "other@example.com"],
+            cwd=git_repo,
+            check=True,
+            capture_output=True,
+        )
+        assert git.user_email == "test@example.com"
+        assert git.config("user.email") == "test@example.com"
+
     def test_toplevel(self, git, git_repo):
         assert git.toplevel == str(git_repo)
 
     def test_git_dir(self, git):
         assert ".git" in git.git_dir
 
+    def test_git_dir_outside_work_tree(self, git_repo):
+        from common.git import Git
+
+        git = Git(cwd=str(git_repo / ".git"))
+        assert git.toplevel == ""
+        assert git.git_dir == "."
+
+    def test_paths_outside_repository(self, tmp_path):
+        from common.git import Git
+
+        (tmp_path / "plain").mkdir()
+        git = Git(cwd=str(tmp_path / "plain"))
+        assert git.toplevel == ""
+        assert git.git_dir == ""
+
     def test_branch_show_current_main(self, git, git_repo):
         (git_repo / "file.txt").write_text("content")
         subprocess.run(
@@ -96,6 +122,10 @@ class TestGit:
         )
         assert git.is_detached_head() is False
 
+    def test_is_detached_head_unborn_branch(self, git):
+        # A fresh repository is on an unborn branch, not detached
+        assert git.is_detached_head() is False
+
     def test_is_detached_head_after_checkout(self, git, git_repo):
         (git_repo / "file.txt").write_text("content")
         subprocess.run(
@@ -132,6 +162,22 @@ class TestGit:
         sha = git.rev_parse_short_head()
         assert len(sha) == 7
 
+    def test_rev_parse_resolves_revision(self, git, git_repo):
+        (git_repo / "file.txt").write_text("content")
+        git.add("file.txt")
+        git.commit("Initial")
+        expected = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=git_repo,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+        assert git.rev_parse("HEAD") == expected
+
+    def test_rev_parse_missing_revision(self, git):
+        assert git.rev_parse("HEAD") == ""
+
     def test_diff_name_only_no_changes(self, git, git_repo):
         assert git.diff_name_only() == []
 
@@ -173,10 +219,102 @@ class TestGit:
         (git_repo / "file.txt").write_text("modified")
         assert git.has_changes() is True
 
+    def test_status_porcelain_v2_clean(self, git, git_repo):
+        (git_repo / "file.txt").write_text("content")
+        git.add("file.txt")
+        git.commit("Initial")
+        status = git.status_porcelain_v2()
+        assert status.branch_head in ("main", "master")
+        assert status.detached is False
+        assert len(status.branch_oid) == 40
+        assert status.has_changes is False
+        assert status.untracked == []
+
+    def test_status_porcelain_v2_with_changes(self, git, git_repo):
+        (git_repo / "file.txt").write_text("original")
+        (git_repo / "other.txt").write_text("original")
+        git.add("file.txt", "other.txt")
+        git.commit("Initial")
+        (git_repo / "file.txt").write_text("modified")
+        (git_repo / "other.txt").write_text("modified")
+        git.add("other.txt")
+        (git_repo / "new file.txt").write_text("content")
+        status = git.status_porcelain_v2()
+        assert status.changed_files == ["file.txt"]
+        assert status.staged_files == ["other.txt"]
+        assert status.untracked == ["new file.txt"]
+        assert status.has_changes is True
+
+    def test_status_porcelain_v2_without_untracked(self, git, git_repo):
+        (git_repo / "file.txt").write_text("original")
+        git.add("file.txt")
+        git.commit("Initial")
+        (git_repo / "file.txt").write_text("modified")
+        (git_repo / "new.txt").write_text("content")
+        status = git.status_porcelain_v2(untracked="no")
+        assert status.changed_files == ["file.txt"]
+        assert status.untracked == []
+
+    def test_status_porcelain_v2_groups_by_status(self, git, git_repo):
+        (git_repo / "modified.txt").write_text("original")
+        (git_repo / "deleted.txt").write_text("original")
+        git.add("modified.txt", "deleted.txt")
+        git.commit("Initial")
+        (git_repo / "added.txt").write_text("content")
+        git.add("added.txt")
+        (git_repo / "modified.txt").write_text("modified")
+        (git_repo / "deleted.txt").unlink()
+        status = git.status_porcelain_v2()
+        assert status.staged_by_status == {"A": ["added.txt"]}
+        assert status.changed_by_status == {
+            "D": ["deleted.txt"],
+            "M": ["modified.txt"],
+        }
+
+    def test_status_porcelain_v2_merge_conflict(self, git, git_repo):
+        (git_repo / "file.txt").write_text("base")
+        git.add("file.txt")
+        git.commit("Initial")
+        git.checkout_new_branch("other")
+        (git_repo / "file.txt").write_text("other")
+        git.add("file.txt")
+        git.commit("Other")
+        subprocess.run(
+            ["git", "checkout", "-"], cwd=git_repo, check=True, capture_output=True
+        )
+        (git_repo / "file.txt").write_text("ours")
+        git.add("file.txt")
+        git.commit("Ours")
+        subprocess.run(["git", "merge", "other"], cwd=git_repo, capture_output=True)
+        git.invalidate()
+        status = git.status_porcelain_v2()
+        assert status.staged_files == []
+        assert status.changed_files == ["file.txt"]
+        assert status.changed_by_status == {"U": ["file.txt"]}
+
+    def test_status_porcelain_v2_detached(self, git, git_repo):
+        (git_repo / "file.txt").write_text("content")
+        git.add("file.txt")
+        git.commit("Initial")
+        subprocess.run(
+            ["git", "checkout", "--detach"],
+            cwd=git_repo,
+            check=True,
+            capture_output=True,
+        )
+        status = git.status_porcelain_v2()
+        assert status.detached is True
+        assert status.branch_head == ""
+
     def test_ls_files_others(self, git, git_repo):
         (git_repo / "new.txt").write_text("content")
         assert git.ls_files_others() == ["new.txt"]
 
+    def test_ls_files_others_unusual_names(self, git, git_repo):
+        (git_repo / "line\nbreak.txt").write_text("content")
+        (git_repo / "spaced name.txt").write_text("content")
+        assert sorted(git.ls_files_others()) == ["line\nbreak.txt", "spaced name.txt"]
+
     def test_diff_stat(self, git, git_repo):
         # First make an initial commit so we can test tracked file changes
         (git_repo / "file.txt").write_text("original")
@@ -193,6 +331,39 @@ class TestGit:
         stat = git.diff_stat(cached=True)
         assert "file.txt" in stat
 
+    def test_queries_are_cached_until_invalidated(self, git, git_repo):
+        (git_repo / "new.txt").write_text("content")
+        assert git.ls_files_others() == ["new.txt"]
+        (git_repo / "other.txt").write_text("content")
+        assert git.ls_files_others() == ["new.txt"]
+        git.invalidate()
+        assert git.ls_files_others() == ["new.txt", "other.txt"]
+
+    def test_cached_results_are_copies(self, git, git_repo):
+        (git_repo / "new.txt").write_text("content")
+        git.ls_files_others().append("bogus.txt")
+        assert git.ls_files_others() == ["new.txt"]
+
+        status = git.status_porcelain_v2()
+        status.untracked.clear()
+        status.changed_by_status.setdefault("M", []).append("bogus.txt")
+        assert git.status_porcelain_v2().untracked == ["new.txt"]
+        assert git.status_porcelain_v2().changed_by_status == {}
+
+    def test_mutations_invalidate_cached_queries(self, git, git_repo):
+        (git_repo / "file.txt").write_text("content")
+        assert git.diff_name_only(cached=True) == []
+        git.add("file.txt")
+        assert git.diff_name_only(cached=True) == ["file.txt"]
+        git.commit("Initial")
+        assert git.diff_name_only(cached=True) == []
+
+    def test_diff_shortstat(self, git, git_repo):
+        assert git.diff_shortstat(cached=True) == ""
+        (git_repo / "file.txt").write_text("content\n")
+        git.add("file.txt")
+        assert git.diff_shortstat(cached=True) == "1 file changed, 1 insertion(+)"
+
     def test_checkout_new_branch(self, git, git_repo):
         (git_repo / "file.txt").write_text("content")
         subprocess.run(
@@ -1,4 +1,4 @@
 # common.stats - Stats parsing and history utilities
-from common.stats.stats import Stats
+from common.stats.stats import Stats, dumps
 
-__all__ = ["Stats"]
+__all__ = ["Stats", "dumps"]
@@ -1,11 +1,127 @@
+import functools
+import io
 import json
+import mmap
 import os
-import re
 import subprocess
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Box-drawing characters used by the opencode stats table borders
+_BORDER_TABLE = str.maketrans("", "", "│├┤")
+
+# Substrings present on every row parse_stats cares about
+_STATS_KEYWORDS = ("Total Cost", "Input ", "Output ", "Cache Read", "Cache Write")
+
+# Characters that make up a dollar amount such as "5.63"
+_AMOUNT_CHARS = "0123456789."
+
+
+def _parse_fixed(value: str, places: int) -> int:
+    """Parse a decimal string to an int scaled by 10**places, exactly.
+
+    Extra fractional digits are truncated and anything unparseable gives 0.
+    Integer arithmetic avoids float rounding: int(float("0.29") * 100) is 28.
+    """
+    whole, dot, fraction = value.strip().partition(".")
+    try:
+        if not dot:
+            return int(whole) * 10**places
+        if fraction and not fraction.isdigit():
+            return 0
+        number = abs(int(whole or "0")) * 10**places
+        number += int(fraction[:places].ljust(places, "0") or "0")
+    except ValueError:
+        return 0
+    return -number if whole.startswith("-") else number
+
+
+def _parse_total_row(rest: str) -> tuple[str, int] | None:
+    """Parse the rest of a "Total Cost  $5.63" row."""
+    if not rest.startswith("Cost"):
+        return None
+    # Take the run of digits and dots straight after the "$"
+    tail = rest.partition("$")[2]
+    amount = tail.removesuffix(tail.lstrip(_AMOUNT_CHARS))
+    if not amount:
+        return None
+    return "total_cost_cents", _parse_fixed(amount, 2)
+
+
+def _parse_token_row(key: str, rest: str) -> tuple[str, int] | None:
+    """Parse the rest of a row like "Input  2.2M", whose value is stored as key."""
+    words = rest.split()
+    if not words:
+        return None
+    return key, Stats.parse_token_value(words[0])
+
+
+def _parse_cache_row(rest: str) -> tuple[str, int] | None:
+    """Parse the rest of a "Cache Read  109.3M" or "Cache Write  1.2M" row."""
+    words = rest.split()
+    if len(words) < 2 or words[0] not in ("Read", "Write"):
+        return None
+    return "cache_" + words[0].lower(), Stats.parse_token_value(words[-1])
+
+
+# First word of a stats row -> parser for the remainder of that row
+_ROW_PARSERS = {
+    "Total": _parse_total_row,
+    "Input": functools.partial(_parse_token_row, "input_tokens"),
+    "Output": functools.partial(_parse_token_row, "output_tokens"),
+    "Cache": _parse_cache_row,
+}
+
+
+def dumps(obj, indent: bool = False) -> bytes:
+    """Serialize obj as UTF-8 JSON bytes, compact or with a two-space indent.
+
+    Uses orjson when it is installed; the json fallback is configured to
+    produce the same bytes.
+    """
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode()
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _loads(data: bytes):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+@functools.lru_cache(maxsize=1)
+def _read_history(path: str, mtime_ns: int, size: int) -> tuple:
+    """Decode the history file; the stat fields key the cache to its contents."""
+    with open(path, "rb") as f:
+        lines = f.read().splitlines()
+
+    history = []
+    for line in lines:
+        try:
+            entry = _loads(line)
+        except ValueError:
+            continue
+        if isinstance(entry, dict):
+            history.append(entry)
+    return tuple(history)
+
 
 class Stats:
-    HISTORY_FILE = ".stats-history.json"
+    HISTORY_FILE = ".stats-history.jsonl"
+    # JSON array written before the history became JSON Lines
+    LEGACY_HISTORY_FILE = ".stats-history.json"
+    # Fields of a history entry that hold stats, as opposed to name/timestamp
+    STAT_KEYS = (
+        "total_cost_cents",
+        "input_tokens",
+        "output_tokens",
+        "cache_read",
+        "cache_write",
+    )
 
     @staticmethod
     def parse_token_value(value: str) -> int:
@@ -15,94 +131,147 @@ class Stats:
 
         value = value.replace(",", "")
 
-        multiplier = 1
+        places = 0
         if value.endswith("M"):
-            multiplier = 1_000_000
+            places = 6
             value = value[:-1]
         elif value.endswith("K"):
-            multiplier = 1_000
+            places = 3
             value = value[:-1]
 
-        try:
-            return int(float(value) * multiplier)
-        except ValueError:
-            return 0
+        # Fixed-point parse: "2.2M" is exactly 2_200_000, with no float rounding
+        return _parse_fixed(value, places)
 
     @staticmethod
     def parse_cost_value(value: str) -> int:
         """Parse cost value like '$5.63' to cents (int)."""
-        if not value:
-            return 0
-
-        value = value.replace("$", "").strip()
-
-        try:
-            dollars = float(value)
-            return int(dollars * 100)
-        except ValueError:
-            return 0
+        return _parse_fixed(value.replace("$", ""), 2)
 
     @staticmethod
     def parse_stats(output: str) -> dict:
         """Parse opencode stats output into a dictionary."""
-        stats = {
-            "total_cost_cents": 0,
-            "input_tokens": 0,
-            "output_tokens": 0,
-            "cache_read": 0,
-            "cache_write": 0,
-        }
-
-        for line in output.split("\n"):
-            line = line.replace("│", "").replace("├", "").replace("┤", "").strip()
-
-            if not line:
-                continue
-
-            if "$" in line and "Total Cost" in line:
-                match = re.search(r"\$([\d.]+)", line)
-                if match:
-                    stats["total_cost_cents"] = Stats.parse_cost_value(match.group(1))
-
-            elif line.startswith("Input "):
-                parts = line.split()
-                if len(parts) >= 2:
-                    stats["input_tokens"] = Stats.parse_token_value(parts[1])
+        stats = dict.fromkeys(Stats.STAT_KEYS, 0)
 
-            elif line.startswith("Output "):
-                parts = line.split()
-                if len(parts) >= 2:
-                    stats["output_tokens"] = Stats.parse_token_value(parts[1])
+        found = set()
+        # Iterate lazily so parsing can stop as soon as every row has been seen
+        for line in io.StringIO(output):
+            # Most rows are table chrome; reject them before any stripping
+            if not any(keyword in line for keyword in _STATS_KEYWORDS):
+                continue
 
-            elif "Cache Read" in line:
-                parts = line.split()
-                if parts:
-                    stats["cache_read"] = Stats.parse_token_value(parts[-1])
+            head, _, rest = line.translate(_BORDER_TABLE).strip().partition(" ")
+            parser = _ROW_PARSERS.get(head)
+            row = parser(rest) if parser else None
+            if row is None:
+                continue
 
-            elif "Cache Write" in line:
-                parts = line.split()
-                if parts:
-                    stats["cache_write"] = Stats.parse_token_value(parts[-1])
+            key, value = row
+            stats[key] = value
+            found.add(key)
+            if len(found) == len(stats):
+                break
 
         return stats
 
     @staticmethod
     def load_history() -> list:
-        """Load history from JSON file."""
-        if not os.path.exists(Stats.HISTORY_FILE):
+        """Load history from the JSON Lines file, skipping unreadable lines."""
+        path = os.path.abspath(Stats.HISTORY_FILE)
+        try:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                if not Stats._import_legacy_history():
+                    return []
+                st = os.stat(path)
+            history = _read_history(path, st.st_mtime_ns, st.st_size)
+        except OSError:
             return []
+        # Entries are flat, so copying each one keeps callers out of the cache
+        return [dict(entry) for entry in history]
 
+    @staticmethod
+    def _import_legacy_history() -> bool:
+        """Convert a legacy JSON array history to JSON Lines.
+
+        Called only when HISTORY_FILE is missing, so it runs once per history;
+        the legacy file is left in place, untouched. Returns True if
+        HISTORY_FILE was written.
+        """
         try:
-            with open(Stats.HISTORY_FILE, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return []
+            with open(Stats.LEGACY_HISTORY_FILE, "rb") as f:
+                history = _loads(f.read())
+        except (OSError, ValueError):
+            return False
+        if not isinstance(history, list):
+            return False
+
+        # Write beside the target and rename, so a crash never leaves a partial file
+        partial = Stats.HISTORY_FILE + ".tmp"
+        try:
+            with open(partial, "wb") as f:
+                f.write(b"".join(dumps(entry) + b"\n" for entry in history))
+            os.replace(partial, Stats.HISTORY_FILE)
+        except OSError:
+            try:
+                os.remove(partial)
+            except OSError:
+                pass
+            raise
+        _read_history.cache_clear()
+        return True
 
     @staticmethod
-    def save_history(history: list) -> None:
-        """Save history to JSON file."""
-        with open(Stats.HISTORY_FILE, "w") as f:
-            json.dump(history, f, indent=2)
+    def append_history(entry: dict) -> None:
+        """Append a single entry to the JSON Lines history file."""
+        data = dumps(entry) + b"\n"
+        try:
+            # O_APPEND without O_CREAT, so a missing file is noticed here
+            fd = os.open(Stats.HISTORY_FILE, os.O_WRONLY | os.O_APPEND)
+        except FileNotFoundError:
+            Stats._import_legacy_history()
+            flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+            fd = os.open(Stats.HISTORY_FILE, flags, 0o666)
+        with open(fd, "wb") as f:
+            f.write(data)
+        _read_history.cache_clear()
+
+    @staticmethod
+    def load_last_stats_for_name(name: str) -> dict | None:
+        """Get the most recent stats entry for a name without loading all history.
+
+        Searches the history file backwards for the entry's "name" field and
+        decodes only that line, falling back to a full load if the search misses.
+        """
+        needle = b'"name":' + dumps(name)
+        line = None
+        try:
+            with open(Stats.HISTORY_FILE, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    pos = mm.rfind(needle)
+                    if pos != -1:
+                        start = mm.rfind(b"\n", 0, pos) + 1
+                        end = mm.find(b"\n", pos)
+                        line = mm[start:end] if end != -1 else mm[start:]
+        except FileNotFoundError:
+            # First run after upgrading: a one-off full load of imported history
+            if not Stats._import_legacy_history():
+                return None
+            return Stats.get_last_stats_for_name(Stats.load_history(), name)
+        except OSError:
+            return None
+
+        if line is not None:
+            try:
+                entry = _loads(line)
+            except ValueError:
+                entry = None
+            if isinstance(entry, dict) and entry.get("name") == name:
+                return entry
+
+        return Stats.get_last_stats_for_name(Stats.load_history(), name)
 
     @staticmethod
     def get_last_stats_for_name(history: list, name: str) -> dict | None:
@@ -116,22 +285,9 @@ class Stats:
     def calculate_delta(current: dict, last: dict | None) -> dict:
         """Calculate delta between current and last stats."""
         if last is None:
-            return {
-                "total_cost_cents": 0,
-                "input_tokens": 0,
-                "output_tokens": 0,
-                "cache_read": 0,
-                "cache_write": 0,
-            }
-
-        return {
-            "total_cost_cents": current["total_cost_cents"]
-            - last.get("total_cost_cents", 0),
-            "input_tokens": current["input_tokens"] - last.get("input_tokens", 0),
-            "output_tokens": current["output_tokens"] - last.get("output_tokens", 0),
-            "cache_read": current["cache_read"] - last.get("cache_read", 0),
-            "cache_write": current["cache_write"] - last.get("cache_write", 0),
-        }
+            return dict.fromkeys(Stats.STAT_KEYS, 0)
+
+        return {key: current[key] - last.get(key, 0) for key in Stats.STAT_KEYS}
 
     @staticmethod
     def get_opencode_stats() -> str:
@@ -140,11 +296,11 @@ class Stats:
             result = subprocess.run(
                 ["opencode", "stats"],
                 capture_output=True,
-                text=True,
                 check=False,
             )
             if result.returncode != 0:
                 return ""
-            return result.stdout
+            # opencode writes UTF-8 box drawing; decode it directly, not via locale
+            return result.stdout.decode("utf-8", errors="replace")
         except FileNotFoundError:
             return ""
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Tests for common.stats.Stats class
+"""
+
+import os
+
+import pytest
+
+from common.stats import Stats, dumps
+
+OPENCODE_STATS = """\
+┌────────────────────────────────────────────────────────┐
+│                       OVERVIEW                         │
+├────────────────────────────────────────────────────────┤
+│Sessions                                             42 │
+│Messages                                          1,234 │
+│Days                                                  5 │
+└────────────────────────────────────────────────────────┘
+
+┌────────────────────────────────────────────────────────┐
+│                    COST & TOKENS                       │
+├────────────────────────────────────────────────────────┤
+│Total Cost                                        $5.63 │
+│Avg Cost/Day                                      $1.13 │
+│Avg Tokens/Session                                61.1K │
+│Median Tokens/Session                             20.0K │
+│Input                                              2.2M │
+│Output                                           233.0K │
+│Cache Read                                       109.3M │
+│Cache Write                                        1.2M │
+└────────────────────────────────────────────────────────┘
+"""
+
+
+@pytest.fixture
+def history_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+
+
+class TestStats:
+    def test_parse_token_value(self):
+        assert Stats.parse_token_value("2.2M") == 2_200_000
+        assert Stats.parse_token_value("228.9K") == 228_900
+        assert Stats.parse_token_value("1,234") == 1234
+        assert Stats.parse_token_value("") == 0
+        assert Stats.parse_token_value("n/a") == 0
+
+    def test_parse_token_value_is_exact(self):
+        assert Stats.parse_token_value("4.35M") == 4_350_000
+        assert Stats.parse_token_value("1.2345678M") == 1_234_567
+        assert Stats.parse_token_value("0.5K") == 500
+        assert Stats.parse_token_value(".5K") == 500
+        assert Stats.parse_token_value("12") == 12
+        assert Stats.parse_token_value("1.9") == 1
+        assert Stats.parse_token_value("-1.5K") == -1_500
+
+    def test_parse_cost_value(self):
+        assert Stats.parse_cost_value("$5.63") == 563
+        assert Stats.parse_cost_value("") == 0
+        assert Stats.parse_cost_value("free") == 0
+
+    def test_parse_cost_value_is_exact(self):
+        assert Stats.parse_cost_value("$0.29") == 29
+        assert Stats.parse_cost_value("$12") == 1200
+        assert Stats.parse_cost_value("$1.5") == 150
+        assert Stats.parse_cost_value("$1.999") == 199
+        assert Stats.parse_cost_value("$1.2.3") == 0
+        # Only plain decimals are accepted; float() would have taken these
+        assert Stats.parse_cost_value("$1e3") == 0
+        assert Stats.parse_cost_value("inf") == 0
+
+    def test_parse_stats(self):
+        assert Stats.parse_stats(OPENCODE_STATS) == {
+            "total_cost_cents": 563,
+            "input_tokens": 2_200_000,
+            "output_tokens": 233_000,
+            "cache_read": 109_300_000,
+            "cache_write": 1_200_000,
+        }
+
+    def test_parse_stats_empty(self):
+        assert Stats.parse_stats("") == {
+            "total_cost_cents": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_read": 0,
+            "cache_write": 0,
+        }
+
+    def test_parse_stats_stops_after_first_complete_table(self):
+        output = OPENCODE_STATS + "│Input                                    9.9M │\n"
+        assert Stats.parse_stats(output)["input_tokens"] == 2_200_000
+
+    def test_parse_stats_total_cost_amount(self):
+        assert Stats.parse_stats("│Total Cost  $12.50 USD│")["total_cost_cents"] == 1250
+        assert Stats.parse_stats("│Total Cost  $n/a│")["total_cost_cents"] == 0
+
+    def test_calculate_delta(self):
+        current = Stats.parse_stats(OPENCODE_STATS)
+        last = dict(current, total_cost_cents=500, input_tokens=2_000_000)
+        delta = Stats.calculate_delta(current, last)
+        assert delta["total_cost_cents"] == 63
+        assert delta["input_tokens"] == 200_000
+        assert delta["output_tokens"] == 0
+
+    def test_calculate_delta_without_last(self):
+        current = Stats.parse_stats(OPENCODE_STATS)
+        assert set(Stats.calculate_delta(current, None).values()) == {0}
+
+    def test_get_last_stats_for_name(self):
+        history = [
+            {"name": "a", "input_tokens": 1},
+            {"name": "b", "input_tokens": 2},
+            {"name": "a", "input_tokens": 3},
+        ]
+        assert Stats.get_last_stats_for_name(history, "a")["input_tokens"] == 3
+        assert Stats.get_last_stats_for_name(history, "c") is None
+
+    def test_load_history_missing_file(self, history_dir):
+        assert Stats.load_history() == []
+
+    def test_load_history_invalid_file(self, history_dir):
+        (history_dir / Stats.HISTORY_FILE).write_text("{not json")
+        assert Stats.load_history() == []
+
+    def test_append_and_load_history(self, history_dir):
+        Stats.append_history({"name": "default", "input_tokens": 1})
+        Stats.append_history({"name": "other", "input_tokens": 2})
+        assert Stats.load_history() == [
+            {"name": "default", "input_tokens": 1},
+            {"name": "other", "input_tokens": 2},
+        ]
+
+    def test_load_history_sees_appended_entries(self, history_dir):
+        Stats.append_history({"name": "a"})
+        assert Stats.load_history() == [{"name": "a"}]
+        Stats.append_history({"name": "b"})
+        assert Stats.load_history() == [{"name": "a"}, {"name": "b"}]
+
+    def test_load_history_returns_fresh_entries(self, history_dir):
+        Stats.append_history({"name": "a"})
+        history = Stats.load_history()
+        history[0]["name"] = "changed"
+        history.clear()
+        assert Stats.load_history() == [{"name": "a"}]
+
+    def test_load_history_skips_invalid_lines(self, history_dir):
+        (history_dir / Stats.HISTORY_FILE).write_text(
+            '{"name": "a"}\n{not json\n\n{"name": "b"}\n'
+        )
+        assert Stats.load_history() == [{"name": "a"}, {"name": "b"}]
+
+    def test_load_last_stats_for_name(self, history_dir):
+        Stats.append_history({"name": "a", "input_tokens": 1})
+        Stats.append_history({"name": "b", "input_tokens": 2})
+        Stats.append_history({"name": "a", "input_tokens": 3})
+        Stats.append_history({"name": "café", "input_tokens": 4})
+        assert Stats.load_last_stats_for_name("a")["input_tokens"] == 3
+        assert Stats.load_last_stats_for_name("b")["input_tokens"] == 2
+        assert Stats.load_last_stats_for_name("café")["input_tokens"] == 4
+        assert Stats.load_last_stats_for_name("c") is None
+
+    def test_load_last_stats_for_name_empty_or_missing(self, history_dir):
+        assert Stats.load_last_stats_for_name("a") is None
+        (history_dir / Stats.HISTORY_FILE).write_text("")
+        assert Stats.load_last_stats_for_name("a") is None
+
+    def test_load_last_stats_for_name_falls_back_to_full_load(self, history_dir):
+        (history_dir / Stats.HISTORY_FILE).write_text(
+            '{"name": "a", "input_tokens": 1}\n'
+        )
+        assert Stats.load_last_stats_for_name("a")["input_tokens"] == 1
+
+    def test_dumps_compact(self):
+        assert dumps({"error": "café", "n": [1, 2]}) == (
+            '{"error":"café","n":[1,2]}'.encode()
+        )
+
+    def test_dumps_indented(self):
+        assert dumps({"current": {"name": "café"}, "delta": {}}, indent=True) == (
+            '{\n  "current": {\n    "name": "café"\n  },\n  "delta": {}\n}'.encode()
+        )
+
+    def test_imports_legacy_history_once(self, history_dir):
+        legacy = history_dir / Stats.LEGACY_HISTORY_FILE
+        legacy.write_text(
+            '[\n  {"name": "a", "input_tokens": 1},\n'
+            '  {"name": "a", "input_tokens": 2}\n]'
+        )
+        assert Stats.load_last_stats_for_name("a")["input_tokens"] == 2
+
+        Stats.append_history({"name": "a", "input_tokens": 3})
+        assert [entry["input_tokens"] for entry in Stats.load_history()] == [1, 2, 3]
+        # The legacy file is kept as it was, and not imported a second time
+        assert legacy.read_text().startswith("[")
+        assert len(Stats.load_history()) == 3
+
+    def test_ignores_legacy_history_when_jsonl_exists(self, history_dir):
+        (history_dir / Stats.LEGACY_HISTORY_FILE).write_text('[{"name": "old"}]')
+        (history_dir / Stats.HISTORY_FILE).write_text('{"name": "new"}\n')
+        assert Stats.load_history() == [{"name": "new"}]
+
+    def test_legacy_import_failure_leaves_no_partial_file(
+        self, history_dir, monkeypatch
+    ):
+        (history_dir / Stats.LEGACY_HISTORY_FILE).write_text('[{"name": "old"}]')
+
+        def failing_replace(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(os, "replace", failing_replace)
+        with pytest.raises(OSError):
+            Stats.append_history({"name": "new"})
+        assert sorted(p.name for p in history_dir.iterdir()) == [
+            Stats.LEGACY_HISTORY_FILE
+        ]
+
+    def test_legacy_import_skipped_once_jsonl_exists(self, history_dir, monkeypatch):
+        Stats.append_history({"name": "a"})
+
+        def unexpected_import():
+            raise AssertionError("legacy import attempted")
+
+        monkeypatch.setattr(Stats, "_import_legacy_history", unexpected_import)
+        Stats.append_history({"name": "a"})
+        assert Stats.load_last_stats_for_name("a") == {"name": "a"}
+        assert len(Stats.load_history()) == 2
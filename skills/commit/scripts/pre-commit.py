@@ -17,19 +17,26 @@ from datetime import datetime
 
 from common.git import Git
 
-RED = "\033[0;31m"
-GREEN = "\033[0;32m"
-YELLOW = "\033[1;33m"
-NC = "\033[0m"
+# Only emit ANSI colours to a terminal, and honour https://no-color.org
+_COLOR = sys.stdout.isatty() and not os.environ.get("NO_COLOR")
+
+RED = "\033[0;31m" if _COLOR else ""
+GREEN = "\033[0;32m" if _COLOR else ""
+YELLOW = "\033[1;33m" if _COLOR else ""
+NC = "\033[0m" if _COLOR else ""
+
+_TEST_RE = re.compile(r"\.(test|spec)\.")
+_DOCS_RE = re.compile(r"^docs/|README|CHANGELOG")
+_SLUG_RE = re.compile(r"[^a-z0-9]")
 
 
 def detect_change_type(changed_files):
     for f in changed_files:
         if f.startswith("skills/"):
             return "skill"
-        if re.search(r"\.(test|spec)\.", f):
+        if _TEST_RE.search(f):
             return "test"
-        if re.match(r"^docs/|README|CHANGELOG", f):
+        if _DOCS_RE.match(f):
             return "docs"
     return "update"
 
@@ -38,6 +45,7 @@ def generate_branch_name(change_type, changed_files, branch_prefix=None):
     if branch_prefix:
         return branch_prefix
 
+    date_str = datetime.now().strftime("%Y%m%d")
     first_file = changed_files[0] if changed_files else ""
 
     if first_file:
@@ -45,18 +53,15 @@ def generate_branch_name(change_type, changed_files, branch_prefix=None):
         filename = os.path.splitext(os.path.basename(first_file))[0]
 
         dirname_slug = (
-            re.sub(r"[^a-z0-9]", "", dirname.split("/")[-1].lower()) if dirname else ""
+            _SLUG_RE.sub("", dirname.split("/")[-1].lower()) if dirname else ""
         )
-        filename_slug = re.sub(r"[^a-z0-9]", "", filename.lower()) if filename else ""
-
-        date_str = datetime.now().strftime("%Y%m%d")
+        filename_slug = _SLUG_RE.sub("", filename.lower()) if filename else ""
 
         if filename_slug:
             return f"{change_type}/{date_str}-{filename_slug}"
         elif dirname_slug:
             return f"{change_type}/{date_str}-{dirname_slug}"
 
-    date_str = datetime.now().strftime("%Y%m%d")
     return f"{change_type}/{date_str}-update"
 
 
@@ -76,11 +81,12 @@ def check_gpg_config(git):
     print(f"{GREEN}GPG signing configured: {user_email}{NC}")
 
 
-def check_branch(git, branch_prefix=None):
-    current_branch = git.branch_show_current()
-    detached = git.is_detached_head()
+def check_branch(git, status, branch_prefix=None):
+    current_branch = status.branch_head
+    detached = status.detached
 
     if detached:
+        # Rare path: let git abbreviate, honouring core.abbrev and ambiguity
         current_branch = git.rev_parse_short_head()
         print(f"{YELLOW}Detached HEAD state detected. Using ref: {current_branch}{NC}")
 
@@ -91,7 +97,7 @@ def check_branch(git, branch_prefix=None):
             f"{YELLOW}On main/master or detached HEAD. Creating feature branch...{NC}"
         )
 
-        changed_files = [f for f in git.diff_name_only() if f]
+        changed_files = status.changed_files
         change_type = detect_change_type(changed_files)
 
         print(f"Detected change type: {change_type}")
@@ -105,10 +111,10 @@ def check_branch(git, branch_prefix=None):
         print(f"{GREEN}Created and switched to branch: {branch_name}{NC}")
 
 
-def check_changes(git):
+def check_changes(status):
     print("Checking for changes to commit...")
 
-    if not git.has_changes():
+    if not status.has_changes:
         print(f"{YELLOW}No changes to commit.{NC}")
         sys.exit(0)
 
@@ -126,8 +132,13 @@ def main():
     git = Git()
 
     check_gpg_config(git)
-    check_branch(git, branch_prefix)
-    check_changes(git)
+
+    # One git status call answers every branch and change query below; untracked
+    # files are never reported, so don't make git walk for them
+    status = git.status_porcelain_v2(untracked="no")
+
+    check_branch(git, status, branch_prefix)
+    check_changes(status)
 
 
 if __name__ == "__main__":
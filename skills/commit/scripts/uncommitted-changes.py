@@ -17,109 +17,137 @@ Output includes:
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
-from common.git import Git
+from common.git import Git, GitStatus
 
-RED = "\033[0;31m"
-GREEN = "\033[0;32m"
-YELLOW = "\033[1;33m"
-BLUE = "\033[0;34m"
-CYAN = "\033[0;36m"
-NC = "\033[0m"
+# Only emit ANSI colours to a terminal, and honour https://no-color.org
+_COLOR = sys.stdout.isatty() and not os.environ.get("NO_COLOR")
 
+RED = "\033[0;31m" if _COLOR else ""
+GREEN = "\033[0;32m" if _COLOR else ""
+YELLOW = "\033[1;33m" if _COLOR else ""
+BLUE = "\033[0;34m" if _COLOR else ""
+CYAN = "\033[0;36m" if _COLOR else ""
+NC = "\033[0m" if _COLOR else ""
 
-def print_files(files, prefix, color):
-    if not files:
-        return
-    for f in files:
-        if f:
-            print(f"  {prefix} {f}")
-    print("")
 
+@dataclass
+class GitSnapshot:
+    repo_name: str
+    status: GitStatus
+    staged_stat: str
+    unstaged_stat: str
 
-def print_header():
-    print(f"{CYAN}========================================{NC}")
-    print(f"{CYAN}   Uncommitted Changes Report{NC}")
-    print(f"{CYAN}========================================{NC}")
-    print("")
 
+def take_snapshot(git):
+    # The three git queries are independent, so issue them all at once;
+    # toplevel was already resolved alongside git_dir in main()
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        status = executor.submit(git.status_porcelain_v2)
+        staged_stat = executor.submit(git.diff_shortstat, cached=True)
+        unstaged_stat = executor.submit(git.diff_shortstat)
+        return GitSnapshot(
+            repo_name=os.path.basename(git.toplevel),
+            status=status.result(),
+            staged_stat=staged_stat.result(),
+            unstaged_stat=unstaged_stat.result(),
+        )
 
-def print_repo_info(git):
-    repo_name = os.path.basename(git.toplevel)
-    branch = git.branch_show_current() or "detached HEAD"
-    print(f"{BLUE}Repository:{NC} {repo_name}")
-    print(f"{BLUE}Branch:{NC} {branch}")
-    print("")
 
+def print_files(files, prefix, color):
+    if not files:
+        return
+    sys.stdout.write("".join(f"  {prefix} {f}\n" for f in files) + "\n")
 
-def print_staged_changes(git):
-    staged_added = git.diff_name_only(cached=True, diff_filter="A")
-    staged_modified = git.diff_name_only(cached=True, diff_filter="M")
-    staged_deleted = git.diff_name_only(cached=True, diff_filter="D")
-    staged_total = git.diff_name_only(cached=True)
 
-    if not staged_total:
+def print_header():
+    sys.stdout.write(
+        f"{CYAN}========================================{NC}\n"
+        f"{CYAN}   Uncommitted Changes Report{NC}\n"
+        f"{CYAN}========================================{NC}\n"
+        "\n"
+    )
+
+
+def print_repo_info(snapshot):
+    branch = snapshot.status.branch_head or "detached HEAD"
+    sys.stdout.write(
+        f"{BLUE}Repository:{NC} {snapshot.repo_name}\n"
+        f"{BLUE}Branch:{NC} {branch}\n"
+        "\n"
+    )
+
+
+def print_staged_changes(snapshot):
+    status = snapshot.status
+    if not status.staged_files:
         return
 
+    staged_added = status.staged_by_status.get("A", [])
+    staged_modified = status.staged_by_status.get("M", [])
+    staged_deleted = status.staged_by_status.get("D", [])
+
     print(f"{GREEN}STAGED CHANGES (ready to commit):{NC}")
     print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
 
     if staged_added:
-        count = len([f for f in staged_added if f])
+        count = len(staged_added)
         print(f"{GREEN}Added ({count} files):{NC}")
         print_files(staged_added, "+", GREEN)
 
     if staged_modified:
-        count = len([f for f in staged_modified if f])
+        count = len(staged_modified)
         print(f"{YELLOW}Modified ({count} files):{NC}")
         print_files(staged_modified, "~", YELLOW)
 
     if staged_deleted:
-        count = len([f for f in staged_deleted if f])
+        count = len(staged_deleted)
         print(f"{RED}Deleted ({count} files):{NC}")
         print_files(staged_deleted, "-", RED)
 
     print(f"{CYAN}Staged Changes Summary:{NC}")
-    stat = git.diff_stat(cached=True)
-    if stat:
-        lines = stat.split("\n")
-        if lines:
-            print(f"  {lines[-1]}")
+    if snapshot.staged_stat:
+        print(f"  {snapshot.staged_stat}")
     print("")
 
 
-def print_unstaged_changes(git):
-    unstaged_modified = git.diff_name_only(diff_filter="M")
-    unstaged_deleted = git.diff_name_only(diff_filter="D")
-    unstaged_total = git.diff_name_only()
-
-    if not unstaged_total:
+def print_unstaged_changes(snapshot):
+    status = snapshot.status
+    if not status.changed_files:
         return
 
+    unstaged_conflicted = status.changed_by_status.get("U", [])
+    unstaged_modified = status.changed_by_status.get("M", [])
+    unstaged_deleted = status.changed_by_status.get("D", [])
+
     print(f"{YELLOW}UNSTAGED CHANGES (not ready to commit):{NC}")
     print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
 
+    if unstaged_conflicted:
+        count = len(unstaged_conflicted)
+        print(f"{RED}Conflicted ({count} files):{NC}")
+        print_files(unstaged_conflicted, "!", RED)
+
     if unstaged_modified:
-        count = len([f for f in unstaged_modified if f])
+        count = len(unstaged_modified)
         print(f"{YELLOW}Modified ({count} files):{NC}")
         print_files(unstaged_modified, "~", YELLOW)
 
     if unstaged_deleted:
-        count = len([f for f in unstaged_deleted if f])
+        count = len(unstaged_deleted)
         print(f"{RED}Deleted ({count} files):{NC}")
         print_files(unstaged_deleted, "-", RED)
 
     print(f"{CYAN}Unstaged Changes Summary:{NC}")
-    stat = git.diff_stat()
-    if stat:
-        lines = stat.split("\n")
-        if lines:
-            print(f"  {lines[-1]}")
+    if snapshot.unstaged_stat:
+        print(f"  {snapshot.unstaged_stat}")
     print("")
 
 
-def print_untracked(git):
-    untracked = [f for f in git.ls_files_others() if f]
+def print_untracked(snapshot):
+    untracked = snapshot.status.untracked
 
     if not untracked:
         return
@@ -130,14 +158,15 @@ def print_untracked(git):
     print("")
 
 
-def print_summary(git):
-    staged = git.diff_name_only(cached=True)
-    unstaged = git.diff_name_only()
-    untracked = git.ls_files_others()
+def print_summary(snapshot):
+    status = snapshot.status
+    staged = status.staged_files
+    unstaged = status.changed_files
+    untracked = status.untracked
 
-    staged_count = len([f for f in staged if f])
-    unstaged_count = len([f for f in unstaged if f])
-    untracked_count = len([f for f in untracked if f])
+    staged_count = len(staged)
+    unstaged_count = len(unstaged)
+    untracked_count = len(untracked)
     total = staged_count + unstaged_count + untracked_count
 
     print(f"{CYAN}========================================{NC}")
@@ -166,17 +195,21 @@ def main():
         print(f"{RED}Error: Not a git repository{NC}")
         sys.exit(1)
 
+    # Gather all repository state up front; the print_* helpers only format it
+    snapshot = take_snapshot(git)
+    status = snapshot.status
+
     print_header()
-    print_repo_info(git)
+    print_repo_info(snapshot)
 
-    if not git.has_changes() and not git.ls_files_others():
+    if not status.has_changes and not status.untracked:
         print(f"{GREEN}✓ Working directory clean - no uncommitted changes{NC}")
         sys.exit(0)
 
-    print_staged_changes(git)
-    print_unstaged_changes(git)
-    print_untracked(git)
-    print_summary(git)
+    print_staged_changes(snapshot)
+    print_unstaged_changes(snapshot)
+    print_untracked(snapshot)
+    print_summary(snapshot)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Shared fixtures and paths for the commit skill tests
+"""
+
+import os
+import subprocess
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+SCRIPTS_DIR = os.path.join(PROJECT_ROOT, "skills", "commit", "scripts")
+
+
+@pytest.fixture(scope="session")
+def repo_template(tmp_path_factory):
+    # Initialised once per session; tests copy it rather than running git init
+    template = tmp_path_factory.mktemp("repo_template")
+    subprocess.run(["git", "init"], cwd=template, check=True, capture_output=True)
+    # Write the local config directly rather than running git config three times
+    with open(template / ".git" / "config", "a") as config:
+        config.write(
+            "[user]\n"
+            "\temail = test@example.com\n"
+            "\tname = Test User\n"
+            "[commit]\n"
+            "\tgpgsign = false\n"
+        )
+
+    return template
@@ -9,52 +9,102 @@ These tests verify the deterministic pre-commit logic including:
 - Detached HEAD handling
 """
 
+import contextlib
+import io
 import os
+import py_compile
+import runpy
+import shutil
 import subprocess
+import sys
+from dataclasses import dataclass, field
 
 import pytest
+from conftest import PROJECT_ROOT, SCRIPTS_DIR
+
+
+@pytest.fixture(scope="session")
+def git_template(tmp_path_factory, repo_template):
+    # Built once per session on top of repo_template; each test gets its own
+    # copy via git_repo
+    template = tmp_path_factory.mktemp("git_template") / "repo"
+    shutil.copytree(repo_template, template)
+
+    shutil.copy2(os.path.join(SCRIPTS_DIR, "pre-commit.py"), template / "pre-commit.py")
+    os.chmod(template / "pre-commit.py", 0o755)
+    # A script run as __main__ never reads __pycache__, so compile it once here
+    # for run_script_inprocess to execute the bytecode directly
+    py_compile.compile(
+        str(template / "pre-commit.py"),
+        cfile=str(template / "pre-commit.pyc"),
+        doraise=True,
+    )
+
+    return template
 
 
 @pytest.fixture
-def git_repo(tmp_path):
-    os.chdir(tmp_path)
-    subprocess.run(["git", "init"], check=True, capture_output=True)
-    subprocess.run(
-        ["git", "config", "user.email", "test@example.com"],
-        check=True,
-        capture_output=True,
-    )
-    subprocess.run(
-        ["git", "config", "user.name", "Test User"], check=True, capture_output=True
-    )
-    subprocess.run(
-        ["git", "config", "commit.gpgsign", "false"], check=True, capture_output=True
-    )
+def git_repo(tmp_path, git_template):
+    repo = tmp_path / "repo"
+    shutil.copytree(git_template, repo)
+    os.chdir(repo)
 
-    script_path = os.path.join(
-        os.path.dirname(__file__), "..", "scripts", "pre-commit.py"
-    )
-    subprocess.run(["cp", script_path, "."], check=True, capture_output=True)
-    subprocess.run(["chmod", "+x", "pre-commit.py"], check=True, capture_output=True)
+    yield repo
+
+
+def current_branch(repo):
+    # Read HEAD directly instead of forking git branch --show-current
+    head = (repo / ".git" / "HEAD").read_text().strip()
+    if head.startswith("ref: refs/heads/"):
+        return head.removeprefix("ref: refs/heads/")
+    return None
 
-    yield tmp_path
 
+@dataclass(frozen=True)
+class ScriptResult:
+    returncode: int
+    stdout: str
+    # Output split once, so exact-line assertions are set lookups
+    lines: frozenset = field(init=False)
 
-def run_script(cwd, *args):
+    def __post_init__(self):
+        object.__setattr__(self, "lines", frozenset(self.stdout.splitlines()))
+
+
+def run_script_subprocess(cwd, *args):
+    # End-to-end: run the script in a fresh interpreter, as the skill does
     env = os.environ.copy()
     # Set PYTHONPATH to project root so the script can find skills package
-    project_root = os.path.dirname(
-        os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-    )
-    env["PYTHONPATH"] = project_root
+    env["PYTHONPATH"] = PROJECT_ROOT
     result = subprocess.run(
-        ["python3", "./pre-commit.py"] + list(args),
+        ["./pre-commit.py"] + list(args),
         cwd=cwd,
         capture_output=True,
         text=True,
         env=env,
     )
-    return result
+    return ScriptResult(returncode=result.returncode, stdout=result.stdout)
+
+
+def run_script_inprocess(cwd, *args):
+    # Run the script in this interpreter to skip Python start-up per test
+    os.chdir(cwd)
+    saved_argv = sys.argv
+    saved_path = sys.path[:]
+    sys.argv = ["pre-commit.py"] + list(args)
+    # The in-process equivalent of PYTHONPATH, so common imports without it
+    sys.path.insert(0, PROJECT_ROOT)
+    stdout = io.StringIO()
+    returncode = 0
+    try:
+        with contextlib.redirect_stdout(stdout):
+            runpy.run_path(str(cwd / "pre-commit.pyc"), run_name="__main__")
+    except SystemExit as exc:
+        returncode = exc.code or 0
+    finally:
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+    return ScriptResult(returncode=returncode, stdout=stdout.getvalue())
 
 
 class TestPreCommit:
@@ -85,11 +135,20 @@ class TestPreCommit:
 
         (git_repo / "file.txt").write_text("initial\nnew content\n")
 
-        result = run_script(git_repo)
+        result = run_script_subprocess(git_repo)
         assert result.returncode == 0
         assert "GPG signing configured" in result.stdout
 
-    def test_creates_skill_branch_when_on_main_with_skills_changes(self, git_repo):
+    @pytest.mark.parametrize(
+        "path,expected_type",
+        [
+            ("skills/test/file.txt", "skill"),
+            ("app.test.js", "test"),
+            ("docs/README.md", "docs"),
+            ("random.txt", "update"),
+        ],
+    )
+    def test_creates_typed_branch_when_on_main(self, git_repo, path, expected_type):
         subprocess.run(
             ["git", "config", "user.signingkey", "12345678"],
             cwd=git_repo,
@@ -97,8 +156,9 @@ class TestPreCommit:
             capture_output=True,
         )
 
-        (git_repo / "skills" / "test").mkdir(parents=True)
-        (git_repo / "skills" / "test" / "file.txt").write_text("content")
+        changed_file = git_repo / path
+        changed_file.parent.mkdir(parents=True, exist_ok=True)
+        changed_file.write_text("content")
         subprocess.run(
             ["git", "add", "."], cwd=git_repo, check=True, capture_output=True
         )
@@ -109,120 +169,15 @@ class TestPreCommit:
             capture_output=True,
         )
 
-        (git_repo / "skills" / "test" / "file.txt").write_text("new content")
+        changed_file.write_text("new content")
 
-        result = run_script(git_repo)
+        result = run_script_inprocess(git_repo)
         assert result.returncode == 0
-        assert "Detected change type: skill" in result.stdout
+        assert f"Detected change type: {expected_type}" in result.lines
         assert "Created and switched to branch" in result.stdout
 
-        branch = subprocess.run(
-            ["git", "branch", "--show-current"],
-            cwd=git_repo,
-            capture_output=True,
-            text=True,
-        ).stdout.strip()
-        assert branch.startswith("skill/")
-
-    def test_creates_test_branch_when_on_main_with_test_file_changes(self, git_repo):
-        subprocess.run(
-            ["git", "config", "user.signingkey", "12345678"],
-            cwd=git_repo,
-            check=True,
-            capture_output=True,
-        )
-
-        (git_repo / "app.test.js").write_text("content")
-        subprocess.run(
-            ["git", "add", "."], cwd=git_repo, check=True, capture_output=True
-        )
-        subprocess.run(
-            ["git", "commit", "-m", "Initial commit"],
-            cwd=git_repo,
-            check=True,
-            capture_output=True,
-        )
-
-        (git_repo / "app.test.js").write_text("new content")
-
-        result = run_script(git_repo)
-        assert result.returncode == 0
-        assert "Detected change type: test" in result.stdout
-
-        branch = subprocess.run(
-            ["git", "branch", "--show-current"],
-            cwd=git_repo,
-            capture_output=True,
-            text=True,
-        ).stdout.strip()
-        assert branch.startswith("test/")
-
-    def test_creates_docs_branch_when_on_main_with_docs_changes(self, git_repo):
-        subprocess.run(
-            ["git", "config", "user.signingkey", "12345678"],
-            cwd=git_repo,
-            check=True,
-            capture_output=True,
-        )
-
-        (git_repo / "docs").mkdir(parents=True)
-        (git_repo / "docs" / "README.md").write_text("content")
-        subprocess.run(
-            ["git", "add", "."], cwd=git_repo, check=True, capture_output=True
-        )
-        subprocess.run(
-            ["git", "commit", "-m", "Initial commit"],
-            cwd=git_repo,
-            check=True,
-            capture_output=True,
-        )
-
-        (git_repo / "docs" / "README.md").write_text("new content")
-
-        result = run_script(git_repo)
-        assert result.returncode == 0
-        assert "Detected change type: docs" in result.stdout
-
-        branch = subprocess.run(
-            ["git", "branch", "--show-current"],
-            cwd=git_repo,
-            capture_output=True,
-            text=True,
-        ).stdout.strip()
-        assert branch.startswith("docs/")
-
-    def test_creates_update_branch_when_on_main_with_other_changes(self, git_repo):
-        subprocess.run(
-            ["git", "config", "user.signingkey", "12345678"],
-            cwd=git_repo,
-            check=True,
-            capture_output=True,
-        )
-
-        (git_repo / "random.txt").write_text("content")
-        subprocess.run(
-            ["git", "add", "."], cwd=git_repo, check=True, capture_output=True
-        )
-        subprocess.run(
-            ["git", "commit", "-m", "Initial commit"],
-            cwd=git_repo,
-            check=True,
-            capture_output=True,
-        )
-
-        (git_repo / "random.txt").write_text("new content")
-
-        result = run_script(git_repo)
-        assert result.returncode == 0
-        assert "Detected change type: update" in result.stdout
-
-        branch = subprocess.run(
-            ["git", "branch", "--show-current"],
-            cwd=git_repo,
-            capture_output=True,
-            text=True,
-        ).stdout.strip()
-        assert branch.startswith("update/")
+        branch = current_branch(git_repo)
+        assert branch.startswith(f"{expected_type}/")
 
     def test_creates_branch_on_master(self, git_repo):
         subprocess.run(
@@ -251,16 +206,11 @@ class TestPreCommit:
 
         (git_repo / "file.txt").write_text("new content")
 
-        result = run_script(git_repo)
+        result = run_script_inprocess(git_repo)
         assert result.returncode == 0
         assert "On main/master" in result.stdout
 
-        branch = subprocess.run(
-            ["git", "branch", "--show-current"],
-            cwd=git_repo,
-            capture_output=True,
-            text=True,
-        ).stdout.strip()
+        branch = current_branch(git_repo)
         assert branch != "master"
 
     def test_uses_custom_branch_prefix_when_provided(self, git_repo):
@@ -284,16 +234,11 @@ class TestPreCommit:
 
         (git_repo / "file.txt").write_text("new content")
 
-        result = run_script(git_repo, "feature/custom-branch")
+        result = run_script_inprocess(git_repo, "feature/custom-branch")
         assert result.returncode == 0
-        assert "Creating branch: feature/custom-branch" in result.stdout
+        assert "Creating branch: feature/custom-branch" in result.lines
 
-        branch = subprocess.run(
-            ["git", "branch", "--show-current"],
-            cwd=git_repo,
-            capture_output=True,
-            text=True,
-        ).stdout.strip()
+        branch = current_branch(git_repo)
         assert branch == "feature/custom-branch"
 
     def test_does_nothing_when_not_on_main_master_and_has_changes(self, git_repo):
@@ -324,17 +269,12 @@ class TestPreCommit:
 
         (git_repo / "file.txt").write_text("new content")
 
-        result = run_script(git_repo)
+        result = run_script_inprocess(git_repo)
         assert result.returncode == 0
-        assert "Current branch: feature/existing-branch" in result.stdout
+        assert "Current branch: feature/existing-branch" in result.lines
         assert "Creating feature branch" not in result.stdout
 
-        branch = subprocess.run(
-            ["git", "branch", "--show-current"],
-            cwd=git_repo,
-            capture_output=True,
-            text=True,
-        ).stdout.strip()
+        branch = current_branch(git_repo)
         assert branch == "feature/existing-branch"
 
     def test_handles_detached_head_state(self, git_repo):
@@ -373,7 +313,7 @@ class TestPreCommit:
 
         (git_repo / "new_file.txt").write_text("detached change")
 
-        result = run_script(git_repo)
+        result = run_script_subprocess(git_repo)
         assert result.returncode == 0
         assert "Detached HEAD state detected" in result.stdout
         assert "Creating feature branch" in result.stdout
@@ -397,6 +337,6 @@ class TestPreCommit:
             capture_output=True,
         )
 
-        result = run_script(git_repo)
+        result = run_script_inprocess(git_repo)
         assert result.returncode == 0
         assert "No changes to commit" in result.stdout
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test suite for uncommitted-changes.py script
+
+These tests verify the report sections built from git status, including:
+- Staged, unstaged and untracked files bucketed by status letter
+- Merge conflicts listed once, as conflicted
+- Section counts and the summary totals
+- The clean working directory message
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+from conftest import PROJECT_ROOT, SCRIPTS_DIR
+
+SCRIPT_PATH = os.path.join(SCRIPTS_DIR, "uncommitted-changes.py")
+
+
+def git(repo, *args):
+    subprocess.run(["git"] + list(args), cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def git_repo(tmp_path, repo_template):
+    repo = tmp_path / "repo"
+    shutil.copytree(repo_template, repo)
+    return repo
+
+
+def run_script(cwd):
+    env = os.environ.copy()
+    env["PYTHONPATH"] = PROJECT_ROOT
+    result = subprocess.run(
+        [sys.executable, SCRIPT_PATH],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    return result
+
+
+def section(lines, title, summary):
+    # The lines between a section's title rule and its summary heading
+    start = lines.index(title) + 2
+    end = lines.index(summary)
+    return lines[start:end]
+
+
+class TestUncommittedChanges:
+    def test_reports_each_kind_of_change(self, git_repo):
+        # Distinct contents so git does not pair deletions up as renames
+        for name in ("modified", "deleted", "old", "unstaged", "removed"):
+            (git_repo / f"{name}.txt").write_text(f"{name}\n")
+        git(git_repo, "add", ".")
+        git(git_repo, "commit", "-m", "Initial commit")
+
+        (git_repo / "added.txt").write_text("added\n")
+        (git_repo / "modified.txt").write_text("modified\nmore\n")
+        git(git_repo, "add", "added.txt", "modified.txt")
+        git(git_repo, "rm", "-q", "deleted.txt")
+        git(git_repo, "mv", "old.txt", "renamed.txt")
+        (git_repo / "unstaged.txt").write_text("unstaged\nmore\n")
+        (git_repo / "removed.txt").unlink()
+        (git_repo / "untracked.txt").write_text("untracked\n")
+
+        result = run_script(git_repo)
+        assert result.returncode == 0
+        lines = result.stdout.splitlines()
+
+        staged = section(
+            lines, "STAGED CHANGES (ready to commit):", "Staged Changes Summary:"
+        )
+        assert staged == [
+            "Added (1 files):",
+            "  + added.txt",
+            "",
+            "Modified (1 files):",
+            "  ~ modified.txt",
+            "",
+            "Deleted (1 files):",
+            "  - deleted.txt",
+            "",
+        ]
+
+        unstaged = section(
+            lines,
+            "UNSTAGED CHANGES (not ready to commit):",
+            "Unstaged Changes Summary:",
+        )
+        assert unstaged == [
+            "Modified (1 files):",
+            "  ~ unstaged.txt",
+            "",
+            "Deleted (1 files):",
+            "  - removed.txt",
+            "",
+        ]
+
+        assert "  ? untracked.txt" in lines
+        # The rename is staged, so it counts even though no section lists it
+        assert "  Staged files:     4" in lines
+        assert "  Unstaged files:   2" in lines
+        assert "  Untracked files:  1" in lines
+        assert "  Total changes:    7" in lines
+        assert "Run 'git commit' to commit staged changes" in lines
+
+    def test_reports_merge_conflicts(self, git_repo):
+        (git_repo / "conflict.txt").write_text("base\n")
+        git(git_repo, "add", "conflict.txt")
+        git(git_repo, "commit", "-m", "Initial commit")
+        git(git_repo, "checkout", "-b", "other")
+        (git_repo / "conflict.txt").write_text("other\n")
+        git(git_repo, "commit", "-am", "Other change")
+        git(git_repo, "checkout", "-")
+        (git_repo / "conflict.txt").write_text("ours\n")
+        git(git_repo, "commit", "-am", "Our change")
+        merge = subprocess.run(
+            ["git", "merge", "other"], cwd=git_repo, capture_output=True
+        )
+        assert merge.returncode != 0
+
+        result = run_script(git_repo)
+        assert result.returncode == 0
+        lines = result.stdout.splitlines()
+
+        assert "STAGED CHANGES (ready to commit):" not in lines
+        unstaged = section(
+            lines,
+            "UNSTAGED CHANGES (not ready to commit):",
+            "Unstaged Changes Summary:",
+        )
+        assert unstaged == ["Conflicted (1 files):", "  ! conflict.txt", ""]
+        assert "  Staged files:     0" in lines
+        assert "  Unstaged files:   1" in lines
+        assert "  Total changes:    1" in lines
+
+    def test_reports_clean_working_directory(self, git_repo):
+        (git_repo / "file.txt").write_text("content\n")
+        git(git_repo, "add", "file.txt")
+        git(git_repo, "commit", "-m", "Initial commit")
+
+        result = run_script(git_repo)
+        assert result.returncode == 0
+        assert f"Repository: {git_repo.name}" in result.stdout
+        assert "✓ Working directory clean - no uncommitted changes" in result.stdout
+        assert "Summary" not in result.stdout
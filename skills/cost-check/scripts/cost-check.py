@@ -10,21 +10,27 @@ Usage: python3 cost-check.py [--name NAME]
 
 Output: JSON with "current" and "delta" fields
 """
-import os
 import sys
+from pathlib import Path
 
-sys.path.insert(
-    0,
-    os.path.dirname(
-        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    ),
-)
+# Project root: skills/cost-check/scripts/cost-check.py -> ../../..
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
 import argparse
-import json
-from datetime import datetime
+import operator
+import os
+import time
+
+from common.stats import Stats, dumps
+
+_stat_values = operator.itemgetter(*Stats.STAT_KEYS)
 
-from common.stats import Stats
+
+def print_json(data, indent=False):
+    """Write data to stdout as JSON followed by a newline."""
+    sys.stdout.flush()
+    sys.stdout.buffer.write(dumps(data, indent=indent) + b"\n")
+    sys.stdout.buffer.flush()
 
 
 def main():
@@ -40,7 +46,7 @@ def main():
     output = Stats.get_opencode_stats()
 
     if not output:
-        print(json.dumps({"error": "Failed to get opencode stats"}))
+        print_json({"error": "Failed to get opencode stats"})
         sys.exit(1)
 
     # Parse stats
@@ -49,44 +55,25 @@ def main():
     # Add metadata
     current_entry = {
         "name": args.name,
-        "timestamp": int(datetime.now().timestamp()),
+        "timestamp": int(time.time()),
         **current_stats,
     }
 
-    # Load history
-    history = Stats.load_history()
-
     # Get last stats for this name
-    last_stats = Stats.get_last_stats_for_name(history, args.name)
+    last_stats = Stats.load_last_stats_for_name(args.name)
 
     # Calculate delta
     delta = Stats.calculate_delta(current_stats, last_stats)
 
     # Check if stats changed - only save if different from last
-    should_save = True
-    if last_stats is not None:
-        # Compare only the stats fields (not name/timestamp)
-        current_compare = {
-            "total_cost_cents": current_stats.get("total_cost_cents", 0),
-            "input_tokens": current_stats.get("input_tokens", 0),
-            "output_tokens": current_stats.get("output_tokens", 0),
-            "cache_read": current_stats.get("cache_read", 0),
-            "cache_write": current_stats.get("cache_write", 0),
-        }
-        last_compare = {
-            "total_cost_cents": last_stats.get("total_cost_cents", 0),
-            "input_tokens": last_stats.get("input_tokens", 0),
-            "output_tokens": last_stats.get("output_tokens", 0),
-            "cache_read": last_stats.get("cache_read", 0),
-            "cache_write": last_stats.get("cache_write", 0),
-        }
-        if current_compare == last_compare:
-            should_save = False
+    # Compare only the stats fields (not name/timestamp)
+    should_save = last_stats is None or _stat_values(current_stats) != tuple(
+        last_stats.get(key, 0) for key in Stats.STAT_KEYS
+    )
 
     # Save to history only if changed
     if should_save:
-        history.append(current_entry)
-        Stats.save_history(history)
+        Stats.append_history(current_entry)
 
     # Output result
     result = {
@@ -94,8 +81,14 @@ def main():
         "delta": delta,
     }
 
-    print(json.dumps(result, indent=2))
+    print_json(result, indent=True)
 
 
 if __name__ == "__main__":
     main()
+    # The result is written and the history file closed, and no threads or
+    # child processes are left, so skip interpreter teardown. Anything added
+    # later that needs atexit handlers or finalizers must drop this.
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(0)